@@ -1,12 +1,27 @@
 #!/usr/bin/env python3
 """Build script for creating Thymer binary with Nuitka."""
 
+import os
 import subprocess
 import sys
 import platform
 from pathlib import Path
 
 
+# Modules Thymer never imports; keep Nuitka from following into them.
+# rich.jupyter, rich.syntax and rich.tree are left out on purpose:
+# rich.text/rich.table subclass rich.jupyter.JupyterMixin, rich.traceback
+# (used by textual for crash output) imports rich.syntax, and textual's
+# DOM imports rich.tree.
+NOFOLLOW_IMPORTS = [
+    "tkinter",
+    "unittest",
+    "doctest",
+    "pydoc",
+    "pdb",
+]
+
+
 def build_binary():
     """Build standalone binary using Nuitka."""
     
@@ -34,9 +49,16 @@ def build_binary():
         "--file-version=0.1.0",
         "--include-package=textual",
         "--include-package=rich",
+        "--noinclude-default-mode=nofollow",  # Drop anti-bloat's known-unneeded imports
+        "--python-flag=no_site",
+        "--python-flag=no_asserts",
+        "--python-flag=no_docstrings",
+        "--lto=yes",  # Link-time optimization of the generated C
+        f"--jobs={os.cpu_count() or 1}",  # Parallel C compilation
         "--remove-output",  # Clean build artifacts
-        "src/app.py",
     ]
+    cmd.extend(f"--nofollow-import-to={module}" for module in NOFOLLOW_IMPORTS)
+    cmd.append("src/app.py")
     
     # Add platform-specific options
     if system == "darwin":
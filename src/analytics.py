@@ -1,11 +1,9 @@
 """Analytics and habit tracking for Thymer."""
 
 from typing import Dict, List, Any
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
-from rich.columns import Columns
 from datetime import datetime, timedelta
 from src.storage import ThymerStorage
 from src.timer import format_time
@@ -16,7 +14,6 @@ class AnalyticsDisplay:
     
     def __init__(self, storage: ThymerStorage):
         self.storage = storage
-        self.console = Console()
     
     def show_daily_summary(self) -> Panel:
         """Show today's summary."""
@@ -83,20 +80,17 @@ class AnalyticsDisplay:
         table.add_column("Avg Duration", justify="right")
         table.add_column("Active Days", justify="right")
         
-        # Get unique timer names from recent sessions
-        recent_sessions = self.storage.get_recent_sessions(1000)
-        timer_names = list(set(session.timer_name for session in recent_sessions))
-        
-        for timer_name in sorted(timer_names):
-            stats = self.storage.get_timer_stats(timer_name, 30)
-            if stats:
-                table.add_row(
-                    timer_name,
-                    str(stats['total_sessions']),
-                    format_time(stats['total_time']),
-                    format_time(stats['average_duration']),
-                    str(stats['active_days'])
-                )
+        all_stats = self.storage.get_all_timer_stats(30)
+        
+        for timer_name in sorted(all_stats.keys()):
+            stats = all_stats[timer_name]
+            table.add_row(
+                timer_name,
+                str(stats['total_sessions']),
+                format_time(stats['total_time']),
+                format_time(stats['average_duration']),
+                str(stats['active_days'])
+            )
         
         return table
     
@@ -135,43 +129,21 @@ class AnalyticsDisplay:
         table.add_column("Duration", justify="right")
         table.add_column("Laps", justify="right")
         
-        recent_sessions = self.storage.get_recent_sessions(10)
+        recent_sessions = self.storage.get_recent_session_headers(10)
         
-        for session in recent_sessions:
-            time_str = session.start_time.strftime("%H:%M")
-            duration_str = format_time(session.duration)
-            laps_count = len(session.laps)
+        for start_time, timer_name, duration, laps_count in recent_sessions:
+            time_str = datetime.fromisoformat(start_time).strftime("%H:%M")
+            duration_str = format_time(duration)
             
             table.add_row(
                 time_str,
-                session.timer_name,
+                timer_name,
                 duration_str,
                 str(laps_count)
             )
         
         return table
     
-    def show_full_analytics(self):
-        """Display comprehensive analytics."""
-        self.console.clear()
-        
-        # Create columns layout
-        left_column = [
-            self.show_daily_summary(),
-            self.show_weekly_summary(),
-            self.show_habit_streak()
-        ]
-        
-        right_column = [
-            self.show_timer_stats(),
-            self.show_recent_activity()
-        ]
-        
-        # Display in columns
-        self.console.print(Columns(left_column, equal=True))
-        self.console.print()
-        self.console.print(Columns(right_column, equal=True))
-    
     def export_data(self, filepath: str = None):
         """Export analytics data."""
         if filepath is None:
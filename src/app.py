@@ -2,20 +2,24 @@
 
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Static, Label
-from textual.containers import Container, VerticalScroll
+from textual.containers import Container, Horizontal, VerticalScroll
+from textual.screen import ModalScreen
 from textual.binding import Binding
 from textual import on
 from textual.reactive import reactive
+from rich.markup import escape
 from rich.text import Text
 from rich.panel import Panel
-from rich.table import Table
-from typing import List
-import asyncio
+from typing import List, Optional
 from datetime import datetime
 
 from src.timer import Timer, format_time
 from src.storage import ThymerStorage, Session
-from src.analytics import AnalyticsDisplay
+
+
+def _row(label: str, value: str) -> str:
+    """Format one label/value line of a timer panel as Rich markup."""
+    return f"[bold cyan]{label:<20}[/]  {value}"
 
 
 class TimerDisplay(Static):
@@ -24,47 +28,78 @@ class TimerDisplay(Static):
     timer: Timer = reactive(None)  # type: ignore
     is_selected: bool = reactive(False)
     
+    # Status markup indexed by timer.is_running
+    _STATUS = ("[yellow]⏸ PAUSED[/]", "[green]▶ RUNNING[/]")
+    
     def __init__(self, timer: Timer, **kwargs) -> None:
         super().__init__(**kwargs)
         self.timer = timer
+        # Parts that don't change while the widget is alive
+        name = escape(timer.name)
+        self._static_rows = [_row("Timer:", name)]
+        self._titles = (name, f"[bold]→ {name}[/]")  # indexed by is_selected
+        self._last_seconds: Optional[float] = None
+        self._time_str = ""
     
     def render(self) -> Panel:
         """Render the timer display."""
-        current_time = self.timer.get_time()
-        time_str = format_time(current_time)
-        
-        # Status indicator
-        status = "▶ RUNNING" if self.timer.is_running else "⏸ PAUSED"
-        status_color = "green" if self.timer.is_running else "yellow"
+        # Paused timers re-render with the same time; reuse the formatted string
+        seconds = self.timer.get_time()
+        if seconds != self._last_seconds:
+            self._last_seconds = seconds
+            self._time_str = format_time(seconds)
         
-        # Build the display table
-        table = Table.grid(padding=(0, 2))
-        table.add_column(style="bold cyan", width=20)
-        table.add_column(width=30)
+        lines = self._static_rows + [
+            _row("Time:", f"[bold white]{self._time_str}[/]"),
+            _row("Status:", self._STATUS[self.timer.is_running]),
+        ]
         
-        table.add_row("Timer:", self.timer.name)
-        table.add_row("Time:", f"[bold white]{time_str}[/]")
-        table.add_row("Status:", f"[{status_color}]{status}[/]")
-        
-        if self.timer.laps:
-            table.add_row("", "")
-            table.add_row("[bold]Laps:", f"[bold]{len(self.timer.laps)} recorded[/]")
-            for idx, lap in enumerate(self.timer.laps[-3:], start=max(1, len(self.timer.laps) - 2)):
-                lap_time = format_time(lap.duration)
-                table.add_row(f"  Lap {idx}:", lap_time)
-        
-        # Panel style based on selection
-        border_style = "bold blue" if self.is_selected else "dim"
-        title_style = "bold" if self.is_selected else ""
+        laps = self.timer.laps
+        if laps:
+            lines.append("")
+            lines.append(_row("Laps:", f"[bold]{len(laps)} recorded[/]"))
+            for idx, lap in enumerate(laps[-3:], start=max(1, len(laps) - 2)):
+                lines.append(_row(f"  Lap {idx}:", format_time(lap.duration)))
         
         return Panel(
-            table,
-            border_style=border_style,
-            title=f"[{title_style}]{'→ ' if self.is_selected else ''}{self.timer.name}[/]",
-            subtitle=f"[dim]Laps: {len(self.timer.laps)}[/]" if self.timer.laps else None,
+            Text.from_markup("\n".join(lines)),
+            border_style="bold blue" if self.is_selected else "dim",
+            title=self._titles[self.is_selected],
+            subtitle=f"[dim]Laps: {len(laps)}[/]" if laps else None,
         )
 
 
+class AnalyticsScreen(ModalScreen):
+    """Modal screen with analytics and habit tracking panels."""
+    
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Close"),
+    ]
+    
+    def __init__(self, analytics, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Built up front so query errors surface before the screen is pushed
+        self._summary_panels = [
+            analytics.show_daily_summary(),
+            analytics.show_weekly_summary(),
+            analytics.show_habit_streak(),
+        ]
+        self._tables = [
+            analytics.show_timer_stats(),
+            analytics.show_recent_activity(),
+        ]
+    
+    def compose(self) -> ComposeResult:
+        """Compose the analytics layout."""
+        with VerticalScroll(id="analytics_container"):
+            with Horizontal(classes="analytics_row"):
+                for panel in self._summary_panels:
+                    yield Static(panel)
+            with Horizontal(classes="analytics_row"):
+                for table in self._tables:
+                    yield Static(table)
+
+
 class ThymerApp(App):
     """Main Thymer TUI application."""
     
@@ -86,6 +121,29 @@ class ThymerApp(App):
     Footer {
         background: $primary;
     }
+    
+    AnalyticsScreen {
+        align: center middle;
+        background: $background 60%;
+    }
+    
+    #analytics_container {
+        width: 90%;
+        height: 90%;
+        padding: 1 2;
+        border: thick $primary;
+        background: $surface;
+    }
+    
+    .analytics_row {
+        height: auto;
+        margin: 0 0 1 0;
+    }
+    
+    .analytics_row Static {
+        width: 1fr;
+        margin: 0 1;
+    }
     """
     
     BINDINGS = [
@@ -110,11 +168,12 @@ class ThymerApp(App):
         # Create initial timer
         self.timers = [Timer(name="Timer 1")]
         self.selected_index = 0
-        self._update_task = None
+        self._tick_handle = None
+        self._displays: List[TimerDisplay] = []
         
-        # Initialize storage and analytics
+        # Initialize storage; analytics is created on first use
         self.storage = ThymerStorage()
-        self.analytics = AnalyticsDisplay(self.storage)
+        self.analytics = None
     
     def compose(self) -> ComposeResult:
         """Compose the TUI layout."""
@@ -123,6 +182,7 @@ class ThymerApp(App):
             for idx, timer in enumerate(self.timers):
                 display = TimerDisplay(timer, id=f"timer_{idx}")
                 display.is_selected = (idx == self.selected_index)
+                self._displays.append(display)
                 yield display
         yield Footer()
     
@@ -130,20 +190,33 @@ class ThymerApp(App):
         """Set up the app when mounted."""
         self.title = "Thymer - Developer Timer"
         self.sub_title = "Productivity Timer for Developers"
-        # Start update loop
-        self._update_task = asyncio.create_task(self._update_loop())
-    
-    async def _update_loop(self) -> None:
-        """Continuously update timer displays."""
-        while True:
-            await asyncio.sleep(0.05)  # Update every 50ms
-            for child in self.query(TimerDisplay):
+        # Tick only while at least one timer is running
+        self._tick_handle = self.set_interval(0.1, self._tick, pause=True)
+    
+    def on_unmount(self) -> None:
+        """Release the database connection on exit."""
+        self.storage.close()
+    
+    def _tick(self) -> None:
+        """Refresh the displays of running timers."""
+        for child in self._displays:
+            if child.timer.is_running:
                 child.refresh()
     
+    def _sync_tick(self) -> None:
+        """Pause the tick when no timer is running, resume it otherwise."""
+        if self._tick_handle is None:
+            return
+        if any(timer.is_running for timer in self.timers):
+            self._tick_handle.resume()
+        else:
+            self._tick_handle.pause()
+    
     def action_toggle(self) -> None:
         """Toggle the selected timer."""
         if self.timers:
             self.timers[self.selected_index].toggle()
+            self._sync_tick()
             self._update_displays()
     
     def action_lap(self) -> None:
@@ -164,8 +237,8 @@ class ThymerApp(App):
                 try:
                     session = Session(
                         timer_name=timer.name,
-                        start_time=timer.session_start,
-                        end_time=datetime.now(),
+                        start_time=timer.session_start.isoformat(),
+                        end_time=datetime.now().isoformat(),
                         duration=timer.get_time(),
                         laps=[lap.duration for lap in timer.laps]
                     )
@@ -174,6 +247,7 @@ class ThymerApp(App):
                     self.notify(f"Failed to save session: {e}", title="Warning", timeout=3)
             
             timer.reset()
+            self._sync_tick()
             self._update_displays()
     
     def action_new_timer(self) -> None:
@@ -189,6 +263,7 @@ class ThymerApp(App):
         if len(self.timers) > 1:  # Keep at least one timer
             del self.timers[self.selected_index]
             self.selected_index = min(self.selected_index, len(self.timers) - 1)
+            self._sync_tick()
             self._rebuild_displays()
     
     def action_prev_timer(self) -> None:
@@ -205,16 +280,17 @@ class ThymerApp(App):
     
     def action_show_analytics(self) -> None:
         """Show analytics and habit tracking."""
+        if isinstance(self.screen, AnalyticsScreen):
+            return
         try:
-            self.analytics.show_full_analytics()
-            input("\nPress Enter to return to timer...")
+            self.push_screen(AnalyticsScreen(self._ensure_analytics()))
         except Exception as e:
             self.notify(f"Error showing analytics: {e}", title="Error", timeout=5)
     
     def action_export_data(self) -> None:
         """Export analytics data."""
         try:
-            filepath = self.analytics.export_data()
+            filepath = self._ensure_analytics().export_data()
             self.notify(f"Data exported to: {filepath}", title="Export Complete", timeout=5)
         except Exception as e:
             self.notify(f"Export failed: {e}", title="Error", timeout=5)
@@ -230,30 +306,41 @@ class ThymerApp(App):
         N     : Create new timer
         D     : Delete timer (min 1)
         ↑/↓   : Navigate timers
-        A     : Show analytics
+        A     : Show analytics (Esc to close)
         E     : Export data
         ?     : Show this help
         Q     : Quit application
         """
         self.notify(help_text, title="Help", timeout=10)
     
+    def _ensure_analytics(self):
+        """Import and create the analytics display on first use."""
+        if self.analytics is None:
+            # Deferred so src.analytics stays off the startup path (textual
+            # already imports rich.console and rich.table, so those load regardless)
+            from src.analytics import AnalyticsDisplay
+            self.analytics = AnalyticsDisplay(self.storage)
+        return self.analytics
+    
     def _update_selection(self) -> None:
         """Update which timer is selected."""
-        for idx, display in enumerate(self.query(TimerDisplay)):
+        for idx, display in enumerate(self._displays):
             display.is_selected = (idx == self.selected_index)
     
     def _update_displays(self) -> None:
         """Refresh all timer displays."""
-        for display in self.query(TimerDisplay):
+        for display in self._displays:
             display.refresh()
     
     def _rebuild_displays(self) -> None:
         """Rebuild all timer displays (for add/delete)."""
         container = self.query_one("#timers_container")
         container.remove_children()
+        self._displays.clear()
         for idx, timer in enumerate(self.timers):
             display = TimerDisplay(timer, id=f"timer_{idx}")
             display.is_selected = (idx == self.selected_index)
+            self._displays.append(display)
             container.mount(display)
 
 
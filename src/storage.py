@@ -1,23 +1,58 @@
 """Persistent storage system for Thymer analytics and habit tracking."""
 
+import functools
 import json
 import os
-from datetime import datetime, date
+import time
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 import sqlite3
 
+try:
+    import orjson
+except ImportError:  # optional: faster export_data
+    orjson = None
+
 
 @dataclass
 class Session:
-    """Represents a timer session."""
+    """Represents a timer session.
+    
+    ``start_time`` and ``end_time`` are ISO-format strings as stored; use
+    ``started_at`` / ``ended_at`` for parsed datetimes. Sessions read from
+    storage leave ``laps`` as None until ``ThymerStorage.load_laps`` fills
+    them in; ``lap_count`` is always set.
+    """
     timer_name: str
-    start_time: datetime
-    end_time: Optional[datetime]
+    start_time: str
+    end_time: Optional[str]
     duration: float
-    laps: List[float]
+    laps: Optional[List[float]]
     notes: Optional[str] = None
+    id: Optional[int] = None
+    lap_count: int = 0
+    
+    def __post_init__(self):
+        if self.laps is not None:
+            self.lap_count = len(self.laps)
+    
+    # Parsed values are cached under underscore names, which orjson skips
+    # when serializing the dataclass in export_data.
+    @property
+    def started_at(self) -> datetime:
+        """Session start as a datetime, parsed on first access."""
+        if '_started_at' not in self.__dict__:
+            self._started_at = datetime.fromisoformat(self.start_time)
+        return self._started_at
+    
+    @property
+    def ended_at(self) -> Optional[datetime]:
+        """Session end as a datetime, parsed on first access."""
+        if '_ended_at' not in self.__dict__:
+            self._ended_at = datetime.fromisoformat(self.end_time) if self.end_time else None
+        return self._ended_at
 
 
 @dataclass
@@ -30,39 +65,84 @@ class DailyStats:
     average_session_duration: float
 
 
+def cached(ttl: float):
+    """Memoize a storage query for ``ttl`` seconds, bucketed by calendar day.
+
+    Results live in the instance's ``_cache`` dict, which ``save_sessions``
+    clears so new data is visible immediately. Cached values are shared
+    between callers, so callers must not mutate what they get back.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            today = date.today()
+            key = (func.__name__, args, tuple(sorted(kwargs.items())), today)
+            now = time.monotonic()
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = func(self, *args, **kwargs)
+            # Evict buckets from previous days so a long-running app doesn't accumulate them
+            for stale in [k for k in self._cache if k[-1] != today]:
+                del self._cache[stale]
+            self._cache[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def _cutoff_date(days: int) -> str:
+    """ISO date N days ago, bound as the lower limit of windowed queries.
+
+    Binding the cutoff keeps the SQL text constant across calls, so SQLite's
+    statement cache reuses the prepared plan and indexes on the date columns
+    apply.
+    """
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_app_dir() -> Path:
+    """Get the application data directory."""
+    home = Path.home()
+    
+    # Platform-specific paths
+    if os.name == 'nt':  # Windows
+        app_dir = home / "AppData" / "Local" / "Thymer"
+    elif os.name == 'posix':  # macOS/Linux
+        if os.uname().sysname == "Darwin":  # macOS
+            app_dir = home / "Library" / "Application Support" / "Thymer"
+        else:  # Linux
+            app_dir = home / ".local" / "share" / "thymer"
+    else:
+        app_dir = home / ".thymer"
+    
+    return app_dir
+
+
 class ThymerStorage:
     """Handles persistent storage for Thymer data."""
     
     def __init__(self):
-        self.app_dir = self._get_app_directory()
+        self.app_dir = _resolve_app_dir()
         self.db_path = self.app_dir / "thymer.db"
+        # Query cache: (fn_name, args, kwargs, day) -> (timestamp, value)
+        self._cache: Dict[tuple, tuple] = {}
         self._ensure_app_directory()
         self._init_database()
     
-    def _get_app_directory(self) -> Path:
-        """Get the application data directory."""
-        home = Path.home()
-        
-        # Platform-specific paths
-        if os.name == 'nt':  # Windows
-            app_dir = home / "AppData" / "Local" / "Thymer"
-        elif os.name == 'posix':  # macOS/Linux
-            if os.uname().sysname == "Darwin":  # macOS
-                app_dir = home / "Library" / "Application Support" / "Thymer"
-            else:  # Linux
-                app_dir = home / ".local" / "share" / "thymer"
-        else:
-            app_dir = home / ".thymer"
-        
-        return app_dir
-    
     def _ensure_app_directory(self):
         """Create app directory if it doesn't exist."""
         self.app_dir.mkdir(parents=True, exist_ok=True)
     
     def _init_database(self):
         """Initialize SQLite database."""
-        with sqlite3.connect(self.db_path) as conn:
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA cache_size=-8000")
+        
+        with self._conn as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -72,7 +152,17 @@ class ThymerStorage:
                     duration REAL NOT NULL,
                     laps TEXT NOT NULL,
                     notes TEXT,
-                    created_at TEXT NOT NULL
+                    created_at TEXT NOT NULL,
+                    lap_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS laps (
+                    session_id INTEGER NOT NULL REFERENCES sessions(id),
+                    idx INTEGER NOT NULL,
+                    duration REAL NOT NULL,
+                    PRIMARY KEY (session_id, idx)
                 )
             """)
             
@@ -94,145 +184,323 @@ class ThymerStorage:
                     notes TEXT
                 )
             """)
-    
-    def save_session(self, session: Session):
-        """Save a timer session."""
-        with sqlite3.connect(self.db_path) as conn:
+            
             conn.execute("""
-                INSERT INTO sessions 
-                (timer_name, start_time, end_time, duration, laps, notes, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session.timer_name,
-                session.start_time.isoformat(),
-                session.end_time.isoformat() if session.end_time else None,
-                session.duration,
-                json.dumps(session.laps),
-                session.notes,
-                datetime.now().isoformat()
-            ))
-    
-    def get_recent_sessions(self, limit: int = 50) -> List[Session]:
-        """Get recent timer sessions."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT timer_name, start_time, end_time, duration, laps, notes
-                FROM sessions
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (limit,))
+                CREATE INDEX IF NOT EXISTS idx_sessions_start
+                ON sessions(start_time)
+            """)
             
-            sessions = []
-            for row in cursor.fetchall():
-                sessions.append(Session(
-                    timer_name=row[0],
-                    start_time=datetime.fromisoformat(row[1]),
-                    end_time=datetime.fromisoformat(row[2]) if row[2] else None,
-                    duration=row[3],
-                    laps=json.loads(row[4]),
-                    notes=row[5]
-                ))
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sessions_timer_start
+                ON sessions(timer_name, start_time)
+            """)
             
-            return sessions
+            self._migrate(conn)
     
-    def get_daily_stats(self, days: int = 30) -> List[DailyStats]:
-        """Get daily statistics for the last N days."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
+    def _migrate(self, conn: sqlite3.Connection):
+        """Upgrade databases created by older versions (tracked in user_version)."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 1:
+            # v1: laps moved from the JSON `laps` column into the laps table
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if 'lap_count' not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN lap_count INTEGER NOT NULL DEFAULT 0")
+            
+            rows = conn.execute("SELECT id, laps FROM sessions WHERE laps != '[]'").fetchall()
+            for session_id, laps_json in rows:
+                laps = json.loads(laps_json)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO laps (session_id, idx, duration) VALUES (?, ?, ?)",
+                    [(session_id, idx, duration) for idx, duration in enumerate(laps)]
+                )
+                conn.execute(
+                    "UPDATE sessions SET lap_count = ? WHERE id = ?",
+                    (len(laps), session_id)
+                )
+            conn.execute("PRAGMA user_version = 1")
+        
+        if version < 2:
+            # v2: daily_stats is maintained by save_session; backfill it once
+            conn.execute("DELETE FROM daily_stats")
+            conn.execute("""
+                INSERT INTO daily_stats
+                (date, total_time, session_count, timer_names, average_session_duration)
                 SELECT 
-                    DATE(start_time) as date,
-                    SUM(duration) as total_time,
-                    COUNT(*) as session_count,
-                    GROUP_CONCAT(DISTINCT timer_name) as timer_names,
-                    AVG(duration) as avg_duration
+                    DATE(start_time),
+                    SUM(duration),
+                    COUNT(*),
+                    GROUP_CONCAT(DISTINCT timer_name),
+                    AVG(duration)
                 FROM sessions
-                WHERE DATE(start_time) >= DATE('now', '-{} days')
                 GROUP BY DATE(start_time)
-                ORDER BY date DESC
-            """.format(days))
-            
-            stats = []
-            for row in cursor.fetchall():
-                stats.append(DailyStats(
-                    date=row[0],
-                    total_time=row[1] or 0,
-                    session_count=row[2] or 0,
-                    timer_names=row[3].split(',') if row[3] else [],
-                    average_session_duration=row[4] or 0
+            """)
+            conn.execute("PRAGMA user_version = 2")
+    
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+    
+    def save_session(self, session: Session):
+        """Save a timer session."""
+        self.save_sessions([session])
+    
+    def save_sessions(self, sessions: List[Session]):
+        """Save several timer sessions in a single transaction."""
+        created_at = datetime.now().isoformat()
+        lap_rows = []
+        with self._conn as conn:
+            for session in sessions:
+                laps = session.laps or []
+                # The legacy JSON `laps` column is kept empty; laps live in their own table
+                cursor = conn.execute("""
+                    INSERT INTO sessions 
+                    (timer_name, start_time, end_time, duration, laps, lap_count, notes, created_at)
+                    VALUES (?, ?, ?, ?, '[]', ?, ?, ?)
+                """, (
+                    session.timer_name,
+                    session.start_time,
+                    session.end_time,
+                    session.duration,
+                    len(laps),
+                    session.notes,
+                    created_at
                 ))
+                lap_rows.extend(
+                    (cursor.lastrowid, idx, duration) for idx, duration in enumerate(laps)
+                )
+            
+            conn.executemany("""
+                INSERT INTO laps (session_id, idx, duration)
+                VALUES (?, ?, ?)
+            """, lap_rows)
             
-            return stats
+            # Keep the per-day rollup in step with sessions
+            conn.executemany("""
+                INSERT INTO daily_stats
+                (date, total_time, session_count, timer_names, average_session_duration)
+                VALUES (DATE(?), ?, 1, ?, ?)
+                ON CONFLICT(date) DO UPDATE SET
+                    total_time = total_time + excluded.total_time,
+                    session_count = session_count + 1,
+                    timer_names = CASE
+                        WHEN instr(',' || timer_names || ',', ',' || excluded.timer_names || ',')
+                        THEN timer_names
+                        ELSE timer_names || ',' || excluded.timer_names
+                    END,
+                    average_session_duration =
+                        (total_time + excluded.total_time) / (session_count + 1)
+            """, [
+                (
+                    session.start_time,
+                    session.duration,
+                    session.timer_name,
+                    session.duration
+                )
+                for session in sessions
+            ])
+        self._cache.clear()
     
+    @cached(ttl=60)
+    def get_recent_sessions(self, limit: int = 50) -> List[Session]:
+        """Get recent timer sessions."""
+        cursor = self._conn.execute("""
+            SELECT timer_name, start_time, end_time, duration, notes, id, lap_count
+            FROM sessions
+            ORDER BY created_at DESC
+            LIMIT ?
+        """, (limit,))
+        
+        sessions = []
+        for row in cursor.fetchall():
+            sessions.append(Session(
+                timer_name=row[0],
+                start_time=row[1],
+                end_time=row[2],
+                duration=row[3],
+                laps=None,
+                notes=row[4],
+                id=row[5],
+                lap_count=row[6]
+            ))
+        
+        return sessions
+    
+    @cached(ttl=60)
+    def get_recent_session_headers(self, limit: int = 10) -> List[Tuple[str, str, float, int]]:
+        """Get (start_time, timer_name, duration, lap_count) rows for recent sessions."""
+        cursor = self._conn.execute("""
+            SELECT start_time, timer_name, duration, lap_count
+            FROM sessions
+            ORDER BY start_time DESC
+            LIMIT ?
+        """, (limit,))
+        return cursor.fetchall()
+    
+    def load_laps(self, sessions: List[Session]):
+        """Fill in ``laps`` for sessions returned without them."""
+        pending = {s.id: s for s in sessions if s.laps is None and s.id is not None}
+        for session in pending.values():
+            session.laps = []
+        
+        ids = list(pending)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor = self._conn.execute("""
+                SELECT session_id, duration
+                FROM laps
+                WHERE session_id IN ({})
+                ORDER BY session_id, idx
+            """.format(','.join('?' * len(chunk))), chunk)
+            for session_id, duration in cursor:
+                pending[session_id].laps.append(duration)
+    
+    @cached(ttl=60)
+    def get_daily_stats(self, days: int = 30) -> List[DailyStats]:
+        """Get daily statistics for the last N days."""
+        cutoff = _cutoff_date(days)
+        cursor = self._conn.execute("""
+            SELECT date, total_time, session_count, timer_names, average_session_duration
+            FROM daily_stats
+            WHERE date >= ?
+            ORDER BY date DESC
+        """, (cutoff,))
+        
+        stats = []
+        for row in cursor.fetchall():
+            stats.append(DailyStats(
+                date=row[0],
+                total_time=row[1] or 0,
+                session_count=row[2] or 0,
+                timer_names=row[3].split(',') if row[3] else [],
+                average_session_duration=row[4] or 0
+            ))
+        
+        return stats
+    
+    @cached(ttl=60)
     def get_timer_stats(self, timer_name: str, days: int = 30) -> Dict[str, Any]:
         """Get statistics for a specific timer."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_sessions,
-                    SUM(duration) as total_time,
-                    AVG(duration) as avg_duration,
-                    MIN(duration) as min_duration,
-                    MAX(duration) as max_duration,
-                    COUNT(DISTINCT DATE(start_time)) as active_days
-                FROM sessions
-                WHERE timer_name = ? AND DATE(start_time) >= DATE('now', '-{} days')
-            """.format(days), (timer_name,))
-            
-            row = cursor.fetchone()
-            if not row:
-                return {}
-            
-            return {
-                'total_sessions': row[0],
-                'total_time': row[1] or 0,
-                'average_duration': row[2] or 0,
-                'min_duration': row[3] or 0,
-                'max_duration': row[4] or 0,
-                'active_days': row[5]
+        cutoff = _cutoff_date(days)
+        cursor = self._conn.execute("""
+            SELECT 
+                COUNT(*) as total_sessions,
+                SUM(duration) as total_time,
+                AVG(duration) as avg_duration,
+                MIN(duration) as min_duration,
+                MAX(duration) as max_duration,
+                COUNT(DISTINCT DATE(start_time)) as active_days
+            FROM sessions
+            WHERE timer_name = ? AND start_time >= ?
+        """, (timer_name, cutoff))
+        
+        row = cursor.fetchone()
+        if not row:
+            return {}
+        
+        return {
+            'total_sessions': row[0],
+            'total_time': row[1] or 0,
+            'average_duration': row[2] or 0,
+            'min_duration': row[3] or 0,
+            'max_duration': row[4] or 0,
+            'active_days': row[5]
+        }
+    
+    @cached(ttl=60)
+    def get_all_timer_stats(self, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every timer used in the last N days."""
+        cutoff = _cutoff_date(days)
+        cursor = self._conn.execute("""
+            SELECT 
+                timer_name,
+                COUNT(*) as total_sessions,
+                SUM(duration) as total_time,
+                AVG(duration) as avg_duration,
+                MIN(duration) as min_duration,
+                MAX(duration) as max_duration,
+                COUNT(DISTINCT DATE(start_time)) as active_days
+            FROM sessions
+            WHERE start_time >= ?
+            GROUP BY timer_name
+        """, (cutoff,))
+        
+        return {
+            row[0]: {
+                'total_sessions': row[1],
+                'total_time': row[2] or 0,
+                'average_duration': row[3] or 0,
+                'min_duration': row[4] or 0,
+                'max_duration': row[5] or 0,
+                'active_days': row[6]
             }
+            for row in cursor.fetchall()
+        }
     
     def export_data(self, filepath: str):
         """Export all data to JSON file."""
+        # Copy before load_laps so the cached sessions aren't mutated
+        sessions = [replace(session) for session in self.get_recent_sessions(1000)]
+        self.load_laps(sessions)
+        daily_stats = self.get_daily_stats(365)
+        
+        if orjson is not None:
+            # orjson serializes dataclasses and datetimes natively
+            data = {
+                'sessions': sessions,
+                'daily_stats': daily_stats,
+                'export_date': datetime.now()
+            }
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        
         data = {
-            'sessions': [asdict(session) for session in self.get_recent_sessions(1000)],
-            'daily_stats': [asdict(stat) for stat in self.get_daily_stats(365)],
+            'sessions': [asdict(session) for session in sessions],
+            'daily_stats': [asdict(stat) for stat in daily_stats],
             'export_date': datetime.now().isoformat()
         }
         
         with open(filepath, 'w') as f:
             json.dump(data, f, indent=2, default=str)
     
+    @cached(ttl=60)
     def get_streak_data(self) -> Dict[str, Any]:
         """Calculate habit streaks."""
-        daily_stats = self.get_daily_stats(365)
+        cursor = self._conn.execute("""
+            SELECT date
+            FROM daily_stats
+            ORDER BY date DESC
+        """)
+        active_days = [date.fromisoformat(row[0]) for row in cursor.fetchall()]
         
-        if not daily_stats:
+        if not active_days:
             return {'current_streak': 0, 'longest_streak': 0, 'total_days': 0}
         
-        # Calculate current streak
-        current_streak = 0
-        today = date.today()
+        one_day = timedelta(days=1)
         
-        for stat in daily_stats:
-            stat_date = datetime.fromisoformat(stat.date).date()
-            if stat_date == today or stat_date == today.replace(day=today.day-1):
+        # Current streak only counts if the most recent activity is today or yesterday
+        current_streak = 0
+        if date.today() - active_days[0] <= one_day:
+            current_streak = 1
+            for prev, day in zip(active_days, active_days[1:]):
+                if prev - day != one_day:
+                    break
                 current_streak += 1
-            else:
-                break
-        
-        # Calculate longest streak
-        longest_streak = 0
-        temp_streak = 0
         
-        for stat in daily_stats:
-            if stat.total_time > 0:
+        # Longest run of consecutive active days
+        longest_streak = 1
+        temp_streak = 1
+        for prev, day in zip(active_days, active_days[1:]):
+            if prev - day == one_day:
                 temp_streak += 1
                 longest_streak = max(longest_streak, temp_streak)
             else:
-                temp_streak = 0
+                temp_streak = 1
         
         return {
             'current_streak': current_streak,
             'longest_streak': longest_streak,
-            'total_days': len([s for s in daily_stats if s.total_time > 0])
+            'total_days': len(active_days)
         }
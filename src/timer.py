@@ -17,16 +17,17 @@ class Lap:
 class Timer:
     """Represents a single timer with laps."""
     name: str
-    start_time: Optional[float] = None
+    start_time: Optional[float] = None  # time.monotonic() reading, not wall clock
     elapsed: float = 0.0
     is_running: bool = False
     laps: List[Lap] = field(default_factory=list)
-    session_start: Optional[datetime] = None
+    session_start: Optional[datetime] = None  # wall-clock start, stored with the session
+    _laps_total: float = field(default=0.0, init=False, repr=False)
     
     def start(self) -> None:
         """Start or resume the timer."""
         if not self.is_running:
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
             self.is_running = True
             if self.session_start is None:
                 self.session_start = datetime.now()
@@ -34,7 +35,7 @@ class Timer:
     def pause(self) -> None:
         """Pause the timer."""
         if self.is_running and self.start_time is not None:
-            self.elapsed += time.time() - self.start_time
+            self.elapsed += time.monotonic() - self.start_time
             self.start_time = None
             self.is_running = False
     
@@ -44,19 +45,20 @@ class Timer:
         self.elapsed = 0.0
         self.is_running = False
         self.laps.clear()
+        self._laps_total = 0.0
         self.session_start = None
     
     def lap(self) -> None:
         """Record a lap/split."""
         current_time = self.get_time()
-        last_lap_time = sum(lap.duration for lap in self.laps)
-        lap_duration = current_time - last_lap_time
+        lap_duration = current_time - self._laps_total
+        self._laps_total = current_time
         self.laps.append(Lap(duration=lap_duration, timestamp=current_time))
     
     def get_time(self) -> float:
         """Get the current elapsed time."""
         if self.is_running and self.start_time is not None:
-            return self.elapsed + (time.time() - self.start_time)
+            return self.elapsed + (time.monotonic() - self.start_time)
         return self.elapsed
     
     def toggle(self) -> None:
@@ -69,7 +71,8 @@ class Timer:
 
 def format_time(seconds: float) -> str:
     """Format seconds into HH:MM:SS.mm format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:05.2f}"
+    # Integer centiseconds avoid float modulo and float formatting
+    hours, rem = divmod(round(seconds * 100), 360000)
+    minutes, rem = divmod(rem, 6000)
+    secs, centis = divmod(rem, 100)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{centis:02d}"